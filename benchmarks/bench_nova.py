@@ -0,0 +1,470 @@
+"""Benchmark suite for Nova.
+
+Runs without audio hardware or network access: the TTS engine is a stub,
+follow-up answers come from a script instead of the microphone, and the
+weather, news and speech recognition APIs are served by a local HTTP
+stand-in. Everything runs
+inside a temporary working directory so real notes and alarms are untouched.
+
+    python benchmarks/bench_nova.py --output before.json
+    python benchmarks/bench_nova.py --output after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import math
+import array
+import statistics
+from queue import Queue
+from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Safe commands only: nothing here opens apps, browsers or touches power state
+COMMAND_TEMPLATES = [
+    "what time is it",
+    "what's the date today",
+    "tell me a joke",
+    "how's my cpu",
+    "memory usage",
+    "what's eating my cpu",
+    "battery status",
+    "volume up",
+    "volume down",
+    "what is the volume",
+    "who are you",
+    "how are you",
+    "thank you",
+    "what's your name",
+    "calculate {a} plus {b}",
+    "math {a} times {b}",
+    "what's the weather in {city}",
+    "tell me the {topic} news",
+    "what can you do",
+    "blorp the snorkel {a}",
+]
+STT_SLOW_DELAY = 1.0
+CITIES = ['london', 'delhi', 'mumbai', 'new york', 'tokyo', 'paris']
+TOPICS = ['tech', 'business', 'sports', 'latest']
+
+
+def build_corpus(size):
+    """Build a deterministic command corpus of the given size."""
+    corpus = []
+    for i in range(size):
+        template = COMMAND_TEMPLATES[i % len(COMMAND_TEMPLATES)]
+        corpus.append(template.format(a=i % 97, b=i % 13 + 1,
+                                      city=CITIES[i % len(CITIES)],
+                                      topic=TOPICS[i % len(TOPICS)]))
+    return corpus
+
+
+def summarize(latencies):
+    """Summarize a list of latencies in seconds."""
+    ordered = sorted(latencies)
+    n = len(ordered)
+    return {
+        'count': n,
+        'total_s': sum(ordered),
+        'mean_us': statistics.fmean(ordered) * 1e6 if n else 0.0,
+        'p50_us': ordered[n // 2] * 1e6 if n else 0.0,
+        'p95_us': ordered[min(n - 1, int(n * 0.95))] * 1e6 if n else 0.0,
+        'p99_us': ordered[min(n - 1, int(n * 0.99))] * 1e6 if n else 0.0,
+        'ops_per_s': n / sum(ordered) if n and sum(ordered) else 0.0,
+    }
+
+
+class StubEngine:
+    """pyttsx3 stand-in that records when audio would start playing."""
+
+    def __init__(self):
+        self.properties = {'voices': [], 'rate': 150, 'volume': 1.0, 'voice': None}
+        self.pending = []
+        self.audio_started = []
+
+    def getProperty(self, name):
+        return self.properties.get(name)
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def say(self, text):
+        self.pending.append(text)
+
+    def runAndWait(self):
+        if self.pending:
+            self.audio_started.append(time.perf_counter())
+        self.pending = []
+
+    def stop(self):
+        self.pending = []
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the weather and news APIs."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/weather'):
+            payload = {'cod': 200, 'main': {'temp': 295.15, 'pressure': 1012, 'humidity': 60},
+                       'weather': [{'description': 'clear sky'}]}
+        elif self.path.startswith('/news'):
+            payload = {'status': 'ok', 'totalResults': 5,
+                       'articles': [{'title': f'Headline {i}'} for i in range(5)]}
+        else:
+            payload = {}
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        # Google Web Speech API stand-in; /stt-slow simulates a slow backend
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.startswith('/stt-slow'):
+            time.sleep(STT_SLOW_DELAY)
+        lines = [{'result': []},
+                 {'result': [{'alternative': [{'transcript': 'what time is it', 'confidence': 0.9}], 'final': True}],
+                  'result_index': 0}]
+        body = '\n'.join(json.dumps(line) for line in lines).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_stand_in():
+    """Start the local API stand-in and return (server, base_url)."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_assistant(nova):
+    """Build a headless assistant wired to the stub TTS engine."""
+
+    class BenchAssistant(nova.NovaVoiceAssistant):
+        def __init__(self):
+            self.scripted_answers = []
+            super().__init__(headless=True)
+            self.telemetry.stop()
+            self.telemetry.sample()
+            self.engine = StubEngine()
+            self.speech_engine = 'pyttsx3'
+            # The schedule benchmark sets far more alarms than a person would
+            self.alarms.max_pending = 10 ** 9
+
+        def listen(self):
+            return self.scripted_answers.pop() if self.scripted_answers else None
+
+        def ring_alarm(self):
+            # Scheduling is measured, firing is not
+            return
+
+    return BenchAssistant()
+
+
+def bench_dispatch(assistant, corpus):
+    latencies = []
+    clock = time.perf_counter
+    for command in corpus:
+        start = clock()
+        assistant.process_command(command)
+        latencies.append(clock() - start)
+    return summarize(latencies)
+
+
+def bench_speak(assistant, count):
+    engine = assistant.engine
+    latencies = []
+    for i in range(count):
+        engine.audio_started.clear()
+        start = time.perf_counter()
+        assistant.speak(f"This is benchmark sentence number {i}.")
+        if engine.audio_started:
+            latencies.append(engine.audio_started[0] - start)
+    return summarize(latencies)
+
+
+def bench_stt(nova, base_url, count, hedged=False):
+    """Time SpeechClient against the local stub STT server."""
+    import speech_recognition as sr
+    audio = sr.AudioData(b'\0\0' * 16000, 16000, 2)  # One second of silence
+    encoded = nova.encode_flac(audio)
+    if hedged:
+        # The primary always answers too late, so every request hedges
+        backends = [nova.GoogleSpeechBackend(url=f"{base_url}/stt-slow", name='primary'),
+                    nova.GoogleSpeechBackend(url=f"{base_url}/stt", name='secondary')]
+        client = nova.SpeechClient(backends, deadline=5, hedge=True, hedge_delay=0.05)
+    else:
+        client = nova.SpeechClient([nova.GoogleSpeechBackend(url=f"{base_url}/stt")], deadline=5)
+
+    latencies = []
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            client.recognize(audio, encoded=encoded)
+            latencies.append(time.perf_counter() - start)
+        result = summarize(latencies)
+        result['backends'] = client.stats()
+    finally:
+        client.close()
+    return result
+
+
+def _synthetic_speech(seconds, rate=44100):
+    """Return 16-bit mono PCM that doesn't compress away like silence."""
+    samples = array.array('h', (int(6000 * math.sin(i * 0.05) + 3000 * math.sin(i * 0.31)) + (i * 7919) % 400
+                                for i in range(int(seconds * rate))))
+    return samples.tobytes()
+
+
+def bench_pipeline(nova, base_url, count, capture_s=0.3, handle_s=0.2, use_processes=True):
+    """Compare serial capture/encode/upload with the pipelined version.
+
+    Latency is measured from the moment the main loop picks up a captured
+    phrase to the transcript, for a 3 second phrase at 44.1 kHz.
+    """
+    import speech_recognition as sr
+    pcm = _synthetic_speech(3)
+    client = nova.SpeechClient([nova.GoogleSpeechBackend(url=f"{base_url}/stt")], deadline=10)
+    encoder = nova.AudioEncoder(workers=2, use_processes=use_processes, convert_rate=16000)
+    for future in encoder.warm_up():
+        future.result()
+
+    try:
+        # Serial: capture, then encode and upload on the same thread
+        serial = []
+        for _ in range(count):
+            time.sleep(capture_s)
+            audio = sr.AudioData(pcm, 44100, 2)
+            start = time.perf_counter()
+            client.recognize(audio, encoded=nova.encode_flac(audio, 16000))
+            serial.append(time.perf_counter() - start)
+            time.sleep(handle_s)
+
+        # Pipelined: the next phrase is captured and encoded while this one is handled
+        queue = Queue()
+
+        def capture():
+            for _ in range(count):
+                time.sleep(capture_s)
+                audio = sr.AudioData(pcm, 44100, 2)
+                queue.put(nova.Utterance(audio, encoder.submit(audio), time.perf_counter()))
+
+        Thread(target=capture, daemon=True).start()
+        pipelined = []
+        for _ in range(count):
+            utterance = queue.get()
+            start = time.perf_counter()
+            client.recognize(utterance.audio, encoded=utterance.encoded.result())
+            pipelined.append(time.perf_counter() - start)
+            time.sleep(handle_s)
+    finally:
+        encoder.shutdown()
+        client.close()
+
+    result = summarize(pipelined)
+    result['serial_mean_us'] = statistics.fmean(serial) * 1e6
+    result['saved_per_utterance_ms'] = (statistics.fmean(serial) - statistics.fmean(pipelined)) * 1000
+    result['encoder'] = 'process' if use_processes else 'thread'
+    return result
+
+
+def _spoken_time(i):
+    hour = i % 12 + 1
+    minute = (i * 7) % 60
+    return f"{hour}:{minute:02d} {'am' if i % 2 else 'pm'}"
+
+
+def bench_alarms(assistant, count):
+    latencies = []
+    for i in range(count):
+        assistant.scripted_answers.append(_spoken_time(i))
+        start = time.perf_counter()
+        assistant.set_alarm("set an alarm")
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def bench_reminders(assistant, count):
+    latencies = []
+    for i in range(count):
+        assistant.scripted_answers.append(f"{_spoken_time(i)} call person {i}")
+        start = time.perf_counter()
+        assistant.set_reminder("set a reminder")
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def bench_notes(assistant, count, queries):
+    write = []
+    for i in range(count):
+        start = time.perf_counter()
+        assistant.take_note(f"take a note buy item {i} from shop {i % 50}")
+        write.append(time.perf_counter() - start)
+
+    search = []
+    for i in range(queries):
+        start = time.perf_counter()
+        assistant.search_notes(f"search my notes for shop {i % 50}")
+        search.append(time.perf_counter() - start)
+    return {'write': summarize(write), 'search': summarize(search), 'notes': count}
+
+
+def startup_probe():
+    """Measure import and construction in a fresh interpreter."""
+    start = time.perf_counter()
+    import nova
+    imported = time.perf_counter()
+    nova.pyttsx3.init = lambda *args, **kwargs: StubEngine()
+    assistant = nova.NovaVoiceAssistant(headless=True)
+    ready = time.perf_counter()
+    assistant.telemetry.stop()
+    print(json.dumps({'import_s': imported - start, 'init_s': ready - imported, 'ready_s': ready - start}))
+
+
+def bench_startup(runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--startup-probe'],
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    result = {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+    result['runs'] = runs
+    return result
+
+
+def compare(results, baseline_path):
+    """Print the change against a previous results file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+
+    print(f"\nCompared with {baseline_path}:")
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for key in ('mean_us', 'p95_us', 'ready_s'):
+            if key in current and key in before and before[key]:
+                change = (current[key] - before[key]) / before[key] * 100
+                print(f"  {name:<18} {key:<8} {before[key]:>12.2f} -> {current[key]:>12.2f} ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Nova benchmark suite.")
+    parser.add_argument('--commands', type=int, default=20000, help="dispatch corpus size")
+    parser.add_argument('--speak', type=int, default=2000, help="speak() calls to time")
+    parser.add_argument('--stt', type=int, default=200, help="speech recognition requests to time")
+    parser.add_argument('--utterances', type=int, default=20, help="utterances for the capture pipeline")
+    parser.add_argument('--schedule', type=int, default=10000, help="alarms and reminders to schedule")
+    parser.add_argument('--notes', type=int, default=10000, help="notes to write before searching")
+    parser.add_argument('--note-queries', type=int, default=50)
+    parser.add_argument('--startup-runs', type=int, default=3)
+    parser.add_argument('--quick', action='store_true', help="run with small sizes")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="previous results file to compare against")
+    parser.add_argument('--startup-probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='nova-bench-')
+    output = os.path.abspath(args.output)
+    baseline = os.path.abspath(args.compare) if args.compare else None
+    os.chdir(workdir)
+
+    if args.startup_probe:
+        try:
+            startup_probe()
+        finally:
+            os.chdir(REPO_ROOT)
+            shutil.rmtree(workdir, ignore_errors=True)
+        return 0
+
+    if args.quick:
+        args.commands, args.speak, args.schedule, args.notes, args.stt = 2000, 200, 500, 500, 20
+        args.utterances = 5
+        args.note_queries, args.startup_runs = 10, 1
+
+    import nova
+    server, base_url = start_stand_in()
+    nova.WEATHER_API_KEY = nova.NEWS_API_KEY = 'bench'
+    nova.WEATHER_API_URL = f"{base_url}/weather"
+    nova.NEWS_API_URL = f"{base_url}/news"
+    nova.pyttsx3.init = lambda *a, **kw: StubEngine()
+
+    results = {}
+    try:
+        assistant = make_assistant(nova)
+        steps = [
+            ('dispatch', lambda: bench_dispatch(assistant, build_corpus(args.commands))),
+            ('speak', lambda: bench_speak(assistant, args.speak)),
+            ('stt', lambda: bench_stt(nova, base_url, args.stt)),
+            ('stt_hedged', lambda: bench_stt(nova, base_url, max(1, args.stt // 10), hedged=True)),
+            ('pipeline', lambda: bench_pipeline(nova, base_url, args.utterances)),
+            ('alarm_schedule', lambda: bench_alarms(assistant, args.schedule)),
+            ('reminder_schedule', lambda: bench_reminders(assistant, args.schedule)),
+            ('notes', lambda: bench_notes(assistant, args.notes, args.note_queries)),
+            ('startup', lambda: bench_startup(args.startup_runs)),
+        ]
+        for name, step in steps:
+            print(f"Running {name}...", flush=True)
+            results[name] = step()
+    finally:
+        server.shutdown()
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    # Flatten the note results so they compare like the others
+    results['note_write'] = results['notes'].pop('write')
+    results['note_search'] = results['notes'].pop('search')
+    del results['notes']
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': {'commands': args.commands, 'speak': args.speak,
+                      'schedule': args.schedule, 'notes': args.notes, 'stt': args.stt},
+        },
+        'results': results,
+    }
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in results.items():
+        if name == 'pipeline':
+            print(f"{name:<18} mean {result['mean_us']:>10.1f} us   serial {result['serial_mean_us']:>8.1f} us"
+                  f"   saved {result['saved_per_utterance_ms']:.1f} ms/utterance")
+        elif 'mean_us' in result:
+            print(f"{name:<18} mean {result['mean_us']:>10.1f} us   p95 {result['p95_us']:>10.1f} us"
+                  f"   {result['ops_per_s']:>10.0f} ops/s")
+        else:
+            print(f"{name:<18} ready in {result['ready_s'] * 1000:.0f} ms "
+                  f"(import {result['import_s'] * 1000:.0f} ms, init {result['init_s'] * 1000:.0f} ms)")
+    print(f"Results saved to {output}")
+
+    if baseline:
+        compare(results, baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Soak test for Nova's memory use.
+
+Runs thousands of synthetic text-mode turns through process_command with
+the same stand-ins as the benchmark suite (stub TTS engine, local weather
+and news APIs, temporary working directory) and checks that RSS stays
+flat once the caches have warmed up.
+
+    python benchmarks/soak_nova.py --turns 5000
+    python benchmarks/soak_nova.py --turns 20000 --trace
+
+Exits with status 1 if RSS grew by more than the tolerance.
+"""
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+from bench_nova import REPO_ROOT, StubEngine, build_corpus, make_assistant, start_stand_in
+
+
+def soak(assistant, turns, warmup, sample_every, trace=False):
+    """Run the turns and return RSS samples as (turn, bytes)."""
+    corpus = build_corpus(turns)
+    samples = []
+    for turn, command in enumerate(corpus, 1):
+        assistant.process_command(command)
+        # The stub engine records every utterance; that list is not Nova's memory
+        assistant.engine.audio_started.clear()
+        if turn % sample_every == 0 or turn == warmup:
+            gc.collect()
+            samples.append((turn, assistant.memory.rss()))
+            if trace and turn >= warmup:
+                # Logs the allocation sites that grew since the last sample
+                assistant.memory.check()
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that Nova's RSS stays flat over many turns.")
+    parser.add_argument('--turns', type=int, default=5000)
+    parser.add_argument('--warmup', type=int, default=500, help="turns before the baseline is taken")
+    parser.add_argument('--sample-every', type=int, default=500)
+    parser.add_argument('--tolerance-mb', type=float, default=8.0,
+                        help="allowed RSS growth after warm-up")
+    parser.add_argument('--trace', action='store_true', help="log top allocation growth sites")
+    parser.add_argument('--output', help="write the samples as JSON")
+    args = parser.parse_args(argv)
+    args.warmup = min(args.warmup, args.turns)
+
+    workdir = tempfile.mkdtemp(prefix='nova-soak-')
+    output = os.path.abspath(args.output) if args.output else None
+    os.chdir(workdir)
+
+    import nova
+    server, base_url = start_stand_in()
+    nova.WEATHER_API_KEY = nova.NEWS_API_KEY = 'soak'
+    nova.WEATHER_API_URL = f"{base_url}/weather"
+    nova.NEWS_API_URL = f"{base_url}/news"
+    nova.pyttsx3.init = lambda *a, **kw: StubEngine()
+    # The soak samples memory itself instead of running the watchdog thread
+    if not nova.config.has_section('memory'):
+        nova.config.add_section('memory')
+    nova.config.set('memory', 'budget_mb', '0')
+    nova.config.set('memory', 'trace', 'true' if args.trace else 'false')
+
+    try:
+        assistant = make_assistant(nova)
+        if args.trace:
+            nova.tracemalloc.start()
+        start = time.perf_counter()
+        samples = soak(assistant, args.turns, args.warmup, args.sample_every, trace=args.trace)
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = next(rss for turn, rss in samples if turn >= args.warmup)
+    final = samples[-1][1]
+    growth_mb = (final - baseline) / 1048576
+
+    for turn, rss in samples:
+        print(f"turn {turn:>7}   rss {rss / 1048576:8.1f} MB")
+    print(f"{args.turns} turns in {elapsed:.1f}s; RSS grew {growth_mb:+.1f} MB after warm-up "
+          f"(tolerance {args.tolerance_mb:.1f} MB)")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump({'turns': args.turns, 'warmup': args.warmup, 'growth_mb': growth_mb,
+                       'samples': samples}, f, indent=2)
+
+    if growth_mb > args.tolerance_mb:
+        print("FAIL: memory is not flat")
+        return 1
+    print("OK: memory is flat")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,478 @@
+"""Nova daemon: one warm assistant process serving many local clients.
+
+The daemon loads models, caches and config once and accepts text commands
+or uploaded audio over a local HTTP endpoint. Every client gets its own
+session state, and a bounded worker pool applies backpressure.
+
+Endpoints:
+    POST /command   JSON body {"session": "<id>", "text": "<command>"}
+    POST /audio     WAV/AIFF/FLAC body, session in the X-Nova-Session header
+    GET  /stats     Daemon and session counters
+    GET  /health    Liveness check
+
+Every endpoint except /health needs an "Authorization: Bearer <token>"
+header. The token is [daemon] token in config.ini; when that is empty the
+daemon makes one up at start and writes it to data/daemon.token.
+
+Run it with:
+    python nova_daemon.py --port 8765
+"""
+import io
+import os
+import sys
+import hmac
+import json
+import math
+import time
+import uuid
+import secrets
+import argparse
+import speech_recognition as sr
+from threading import Lock, BoundedSemaphore
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from nova import NovaVoiceAssistant, WAKE_WORDS, STOP_LISTENING_PHRASES, config
+
+TOKEN_FILE = 'data/daemon.token'
+
+
+class DaemonBusy(Exception):
+    """Raised when the worker pool and its queue are full."""
+
+
+class NovaSession(NovaVoiceAssistant):
+    """Per-client view of the shared warm assistant.
+
+    The session shares the recognizer, TTS engine, telemetry and paths of the
+    base assistant, but keeps its own language, listening state and command
+    time. Replies are collected as text instead of being spoken on the host.
+    """
+
+    # Parts that a config reload replaces are read live from the base
+    LIVE_ATTRIBUTES = ('stt', 'tts', 'user_name')
+
+    def __init__(self, base, session_id):
+        self.__dict__.update(base.__dict__)
+        # The host's TTS engine stays untouched; volume is kept per session
+        self.__dict__.pop('engine', None)
+        for name in self.LIVE_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+        self.base = base
+        self.session_id = session_id
+        self.listening = True
+        self.last_command_time = time.time()
+        self.last_seen = time.time()
+        self.replies = []
+        self.lock = Lock()
+
+    @property
+    def stt(self):
+        return self.base.stt
+
+    @property
+    def tts(self):
+        return self.base.tts
+
+    @property
+    def user_name(self):
+        return self.base.user_name
+
+    def speak(self, text, language='en'):
+        """Collect the reply for the client instead of playing it."""
+        self.replies.append({'text': text, 'language': language})
+
+    def listen(self):
+        """Sessions have no microphone; follow-up prompts get no answer."""
+        return None
+
+    def transcribe(self, audio_bytes):
+        """Recognize speech from an uploaded audio file."""
+        with sr.AudioFile(io.BytesIO(audio_bytes)) as source:
+            audio = self.recognizer.record(source)
+        return self.stt.recognize(audio).lower()
+
+    def _refuse_power_command(self):
+        self.speak("System power commands are not available to daemon clients.")
+
+    def _refuse_host_command(self):
+        self.speak("That command runs on the host and is not available to daemon clients.")
+
+    def shutdown_system(self):
+        self._refuse_power_command()
+
+    def restart_system(self):
+        self._refuse_power_command()
+
+    def sleep_system(self):
+        self._refuse_power_command()
+
+    def lock_system(self):
+        self._refuse_power_command()
+
+    def open_application(self, command):
+        self._refuse_host_command()
+
+    def close_application(self, command):
+        self._refuse_host_command()
+
+    def take_screenshot(self):
+        self._refuse_host_command()
+
+    def play_music(self):
+        self._refuse_host_command()
+
+    def pause_music(self):
+        self._refuse_host_command()
+
+    def next_song(self):
+        self._refuse_host_command()
+
+    def solve_math(self, problem):
+        # The expression is evaluated in this process; "9**9**9**9" would stall every worker
+        self._refuse_host_command()
+
+    def set_alarm(self, command):
+        # An alarm would ring on the host, long after this request has returned
+        self.speak("Alarms are not available to daemon clients. Try a reminder instead.")
+
+    def handle(self, command):
+        """Run one command with the same wake/sleep rules as the voice loop."""
+        self.last_seen = time.time()
+        self.replies = []
+        ended = False
+
+        if not self.listening:
+            if any(wake_word in command for wake_word in WAKE_WORDS):
+                self.listening = True
+                self.greet()
+            handled = self.listening
+        elif any(phrase in command for phrase in STOP_LISTENING_PHRASES):
+            self.speak("I'll stop listening now. Say 'Hey Nova' to wake me up.")
+            self.listening = False
+            handled = True
+        else:
+            try:
+                handled = self.process_command(command)
+            except SystemExit:
+                # "Goodbye" ends this client's session, not the daemon
+                handled = True
+                ended = True
+
+        return {
+            'session': self.session_id,
+            'command': command,
+            'handled': bool(handled),
+            'ended': ended,
+            'listening': self.listening,
+            'language': self.preferred_language,
+            'volume': round(self.volume, 2),
+            'replies': self.replies,
+        }
+
+
+class NovaDaemon:
+    """Worker pool and session table in front of one warm assistant."""
+
+    def __init__(self, assistant, workers=4, queue_size=32, request_timeout=30, session_ttl=600,
+                 max_sessions=256):
+        self.assistant = assistant
+        self.workers = workers
+        self.request_timeout = request_timeout
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='nova-worker')
+        # Admits at most `workers` running plus `queue_size` waiting requests
+        self.slots = BoundedSemaphore(workers + queue_size)
+        self.sessions = {}
+        self.sessions_lock = Lock()
+        self.stats_lock = Lock()
+        self.started = time.time()
+        self.counters = {'accepted': 0, 'rejected': 0, 'completed': 0, 'errors': 0, 'timeouts': 0}
+        assistant.memory.register('sessions', self.trim_sessions)
+
+    def _count(self, name):
+        with self.stats_lock:
+            self.counters[name] += 1
+
+    def get_session(self, session_id):
+        """Return the session for a client, creating it on first use."""
+        now = time.time()
+        with self.sessions_lock:
+            # Drop sessions that have been idle for too long
+            expired = [sid for sid, s in self.sessions.items() if now - s.last_seen > self.session_ttl]
+            for sid in expired:
+                del self.sessions[sid]
+
+            session = self.sessions.get(session_id)
+            if session is None:
+                if len(self.sessions) >= self.max_sessions:
+                    # Make room by dropping the longest idle session
+                    idle = min(self.sessions, key=lambda sid: self.sessions[sid].last_seen)
+                    del self.sessions[idle]
+                session = NovaSession(self.assistant, session_id)
+                self.sessions[session_id] = session
+            return session
+
+    def trim_sessions(self, fraction=0.5):
+        """Drop the longest idle fraction of sessions; used by the memory watchdog."""
+        with self.sessions_lock:
+            count = math.ceil(len(self.sessions) * fraction)
+            for sid in sorted(self.sessions, key=lambda sid: self.sessions[sid].last_seen)[:count]:
+                del self.sessions[sid]
+            return count
+
+    def end_session(self, session_id):
+        with self.sessions_lock:
+            self.sessions.pop(session_id, None)
+
+    def submit(self, session_id, text=None, audio=None):
+        """Queue a request, raising DaemonBusy when the daemon is saturated."""
+        if not self.slots.acquire(blocking=False):
+            self._count('rejected')
+            raise DaemonBusy()
+        self._count('accepted')
+        try:
+            future = self.pool.submit(self._run, session_id, text, audio)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def _run(self, session_id, text, audio):
+        """Worker function for one request."""
+        session = self.get_session(session_id)
+        # Commands from one client run in order; different clients run in parallel
+        with session.lock:
+            try:
+                if audio is not None:
+                    try:
+                        text = session.transcribe(audio)
+                    except sr.UnknownValueError:
+                        text = None
+                if not text:
+                    result = {'session': session_id, 'command': None, 'handled': False,
+                              'ended': False, 'listening': session.listening,
+                              'language': session.preferred_language, 'volume': round(session.volume, 2),
+                              'replies': [{'text': "I didn't catch anything in that audio.", 'language': 'en'}]}
+                else:
+                    result = session.handle(text.lower())
+            except Exception:
+                self._count('errors')
+                raise
+
+        if result['ended']:
+            self.end_session(session_id)
+        self._count('completed')
+        return result
+
+    def execute(self, session_id, text=None, audio=None):
+        """Submit a request and wait for its result."""
+        future = self.submit(session_id, text=text, audio=audio)
+        try:
+            return future.result(timeout=self.request_timeout)
+        except FutureTimeout:
+            self._count('timeouts')
+            raise
+
+    def stats(self):
+        with self.stats_lock:
+            counters = dict(self.counters)
+        with self.sessions_lock:
+            sessions = len(self.sessions)
+        return {
+            'uptime': time.time() - self.started,
+            'workers': self.workers,
+            'sessions': sessions,
+            'prefetch': self.assistant.prefetch_stats(),
+            'speech': self.assistant.stt.stats(),
+            'memory': self.assistant.memory.stats(),
+            **counters,
+        }
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
+        self.assistant.telemetry.stop()
+        self.assistant.memory.stop()
+        self.assistant.stt.close()
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for NovaDaemon."""
+
+    server_version = 'NovaDaemon/1.0'
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes on keep-alive connections
+    disable_nagle_algorithm = True
+
+    @property
+    def daemon(self):
+        return self.server.nova_daemon
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate load tests
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        """Check the bearer token, answering 401 if it is missing or wrong."""
+        scheme, _, token = self.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(token.strip().encode(), self.server.token.encode()):
+            return True
+        self._send_json(401, {'error': 'unauthorized'}, headers={'WWW-Authenticate': 'Bearer'})
+        return False
+
+    def _content_type(self):
+        return self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+
+    def _read_body(self):
+        """Return the request body, or None if Content-Length is malformed."""
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            return None
+        if length < 0:
+            return None
+        return self.rfile.read(length) if length else b''
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif not self._authorized():
+            return
+        elif path == '/stats':
+            self._send_json(200, self.daemon.stats())
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self._read_body()
+        if body is None:
+            # The unread body would corrupt the next request on this connection
+            self.close_connection = True
+            self._send_json(400, {'error': 'invalid Content-Length'})
+            return
+        if not self._authorized():
+            return
+
+        if url.path == '/command':
+            if self._content_type() != 'application/json':
+                self._send_json(415, {'error': 'expected application/json'})
+                return
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                self._send_json(400, {'error': 'invalid JSON'})
+                return
+            if not isinstance(payload, dict):
+                self._send_json(400, {'error': 'expected a JSON object'})
+                return
+            session_id = payload.get('session') or uuid.uuid4().hex
+            text, audio = payload.get('text'), None
+            if not isinstance(session_id, str):
+                self._send_json(400, {'error': 'session must be a string'})
+                return
+            if text is not None and not isinstance(text, str):
+                self._send_json(400, {'error': 'text must be a string'})
+                return
+            if not text:
+                self._send_json(400, {'error': 'missing text'})
+                return
+        elif url.path == '/audio':
+            content_type = self._content_type()
+            if not (content_type.startswith('audio/') or content_type == 'application/octet-stream'):
+                self._send_json(415, {'error': 'expected an audio body'})
+                return
+            query = parse_qs(url.query)
+            session_id = (self.headers.get('X-Nova-Session')
+                          or query.get('session', [None])[0]
+                          or uuid.uuid4().hex)
+            text, audio = None, body
+            if not audio:
+                self._send_json(400, {'error': 'missing audio'})
+                return
+        else:
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            result = self.daemon.execute(session_id, text=text, audio=audio)
+        except DaemonBusy:
+            self._send_json(503, {'error': 'busy'}, headers={'Retry-After': '1'})
+        except FutureTimeout:
+            self._send_json(504, {'error': 'timed out'})
+        except sr.RequestError as e:
+            self._send_json(502, {'error': f'speech recognition failed: {e}'})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+        else:
+            self._send_json(200, result)
+
+
+def load_token(path=TOKEN_FILE):
+    """Return the configured client token, or make one up and save it to path."""
+    token = config.get('daemon', 'token', fallback='').strip()
+    if token:
+        return token
+    token = secrets.token_urlsafe(32)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Only the user running the daemon can read the token
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(token)
+    print(f"Daemon token written to {path}")
+    return token
+
+
+def serve(host, port, daemon, token):
+    """Serve the daemon over HTTP until interrupted."""
+    server = ThreadingHTTPServer((host, port), DaemonRequestHandler)
+    server.daemon_threads = True
+    server.nova_daemon = daemon
+    server.token = token
+    print(f"Nova daemon listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Nova as a local multi-client daemon.")
+    parser.add_argument('--host', default=config.get('daemon', 'host', fallback='127.0.0.1'))
+    parser.add_argument('--port', type=int, default=config.getint('daemon', 'port', fallback=8765))
+    parser.add_argument('--workers', type=int, default=config.getint('daemon', 'workers', fallback=4))
+    parser.add_argument('--queue-size', type=int, default=config.getint('daemon', 'queue_size', fallback=32))
+    parser.add_argument('--request-timeout', type=float,
+                        default=config.getfloat('daemon', 'request_timeout', fallback=30))
+    parser.add_argument('--session-ttl', type=float,
+                        default=config.getfloat('daemon', 'session_ttl', fallback=600))
+    parser.add_argument('--max-sessions', type=int,
+                        default=config.getint('daemon', 'max_sessions', fallback=256))
+    args = parser.parse_args(argv)
+
+    assistant = NovaVoiceAssistant(headless=True)
+    daemon = NovaDaemon(assistant, workers=args.workers, queue_size=args.queue_size,
+                        request_timeout=args.request_timeout, session_ttl=args.session_ttl,
+                        max_sessions=args.max_sessions)
+    serve(args.host, args.port, daemon, load_token())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Load-test client for the Nova daemon.
+
+Starts many concurrent clients, each with its own session, and reports
+throughput, latency percentiles and how often the daemon pushed back.
+
+    python nova_loadtest.py --clients 50 --requests 20
+    python nova_loadtest.py --audio sample.wav --clients 10
+
+The daemon token is read from data/daemon.token unless --token is given.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import requests
+from threading import Thread, Lock
+
+DEFAULT_COMMANDS = [
+    "what time is it",
+    "what's the date today",
+    "tell me a joke",
+    "how's my cpu",
+    "memory usage",
+    "what can you do",
+    "who are you",
+    "thank you",
+]
+
+TOKEN_FILE = 'data/daemon.token'
+
+
+def percentile(values, fraction):
+    """Return the given percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LoadTest:
+    """Runs concurrent clients against a daemon and aggregates results."""
+
+    def __init__(self, url, clients, requests_per_client, commands=None, audio=None, timeout=60, token=None):
+        self.url = url.rstrip('/')
+        self.token = token
+        self.clients = clients
+        self.requests_per_client = requests_per_client
+        self.commands = commands or DEFAULT_COMMANDS
+        self.audio = audio
+        self.timeout = timeout
+        self.latencies = []
+        self.statuses = {}
+        self.lock = Lock()
+
+    def _record(self, status, latency):
+        with self.lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status == 200:
+                self.latencies.append(latency)
+
+    def _client(self, index):
+        session_id = f"loadtest-{index}-{uuid.uuid4().hex[:8]}"
+        http = requests.Session()
+        if self.token:
+            http.headers['Authorization'] = f"Bearer {self.token}"
+        for n in range(self.requests_per_client):
+            start = time.perf_counter()
+            try:
+                if self.audio is not None:
+                    response = http.post(f"{self.url}/audio", data=self.audio, timeout=self.timeout,
+                                         headers={'X-Nova-Session': session_id,
+                                                  'Content-Type': 'application/octet-stream'})
+                else:
+                    command = self.commands[(index + n) % len(self.commands)]
+                    response = http.post(f"{self.url}/command", timeout=self.timeout,
+                                         json={'session': session_id, 'text': command})
+                status = response.status_code
+            except requests.RequestException:
+                status = 'connection error'
+            self._record(status, time.perf_counter() - start)
+        http.close()
+
+    def run(self):
+        threads = [Thread(target=self._client, args=(i,)) for i in range(self.clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        total = sum(self.statuses.values())
+        ok = self.statuses.get(200, 0)
+        return {
+            'clients': self.clients,
+            'requests': total,
+            'ok': ok,
+            'busy': self.statuses.get(503, 0),
+            'statuses': {str(k): v for k, v in self.statuses.items()},
+            'elapsed': elapsed,
+            'throughput': ok / elapsed if elapsed else 0.0,
+            'latency_p50': percentile(self.latencies, 0.50),
+            'latency_p95': percentile(self.latencies, 0.95),
+            'latency_p99': percentile(self.latencies, 0.99),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test a running Nova daemon.")
+    parser.add_argument('--url', default='http://127.0.0.1:8765')
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=10, help="requests per client")
+    parser.add_argument('--command', action='append', dest='commands',
+                        help="command text to send (repeatable)")
+    parser.add_argument('--audio', help="audio file to upload instead of text commands")
+    parser.add_argument('--token', help=f"daemon token (default: read from {TOKEN_FILE})")
+    parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    token = args.token
+    if token is None and os.path.exists(TOKEN_FILE):
+        with open(TOKEN_FILE) as f:
+            token = f.read().strip()
+
+    audio = None
+    if args.audio:
+        with open(args.audio, 'rb') as f:
+            audio = f.read()
+
+    summary = LoadTest(args.url, args.clients, args.requests, commands=args.commands, audio=audio,
+                       token=token).run()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{summary['ok']}/{summary['requests']} requests succeeded "
+              f"({summary['busy']} rejected as busy) in {summary['elapsed']:.2f}s")
+        print(f"Throughput: {summary['throughput']:.1f} req/s")
+        print(f"Latency p50/p95/p99: {summary['latency_p50'] * 1000:.0f} / "
+              f"{summary['latency_p95'] * 1000:.0f} / {summary['latency_p99'] * 1000:.0f} ms")
+    return 0 if summary['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Golden tests for alarm and reminder slot filling.
+
+golden_times.json holds spoken commands with the alarm time, named day and
+reminder task they should produce relative to a fixed "now", plus the
+intent each routing case should reach.
+
+    python -m pytest tests
+"""
+import os
+import sys
+import json
+import datetime
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import nova  # noqa: E402
+
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden_times.json')) as f:
+    GOLDEN = json.load(f)
+NOW = datetime.datetime.fromisoformat(GOLDEN['now'])
+
+
+@pytest.mark.parametrize('case', GOLDEN['cases'], ids=lambda case: case['text'])
+def test_time_slots(case):
+    now = datetime.datetime.fromisoformat(case['now']) if 'now' in case else NOW
+    slots = nova.parse_time_expression(case['text'], now=now)
+
+    assert (slots.when.strftime('%Y-%m-%dT%H:%M') if slots.when else None) == case['when']
+    assert (slots.day.isoformat() if slots.day else None) == case.get('day')
+    if 'task' in case:
+        assert nova.reminder_task(slots.rest) == case['task']
+
+
+@pytest.mark.parametrize('case', GOLDEN['routing'], ids=lambda case: case['text'])
+def test_routing(case):
+    entry = nova.match_intent(case['text'])
+    assert (entry[0] if entry else None) == case['intent']